@@ -1,13 +1,14 @@
 """Bitvavo REST API Client code."""
-import datetime
-import hashlib
+import contextlib
 import hmac
 import json
 import logging
 import ssl
+import time
 from typing import Optional
 
 import aiohttp
+import yarl
 
 from bitvavo.BitvavoExceptions import BitvavoException
 from bitvavo.enums import (OrderSide, OrderType, RestCallType,
@@ -15,8 +16,32 @@ from bitvavo.enums import (OrderSide, OrderType, RestCallType,
 from bitvavo.Pair import Pair
 from bitvavo.Timer import Timer
 
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover
+
+    def _dumps(obj) -> bytes:
+        """Serialize to compact json bytes using stdlib json."""
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    _loads = json.loads
+
 LOG = logging.getLogger(__name__)
 
+_NULL_CTX = contextlib.nullcontext()
+
+_REST_CALL_TYPE_BYTES = {
+    rest_call_type: rest_call_type.encode("utf-8")
+    for rest_call_type in RestCallType
+}
+
+_BOOK = "{}/book".format
+_TRADES = "{}/trades".format
+_CANDLES = "{}/candles".format
+
 
 class BitvavoClient:
     """Client Object."""
@@ -31,9 +56,20 @@ class BitvavoClient:
 
         self.api_key = api_key
         self.sec_key = sec_key
+        self._sec_key_bytes = (sec_key or "").encode("utf-8")
 
         self.rest_session = None
         self.ssl_context = ssl.create_default_context()
+        self._connector_kwargs = dict(
+            keepalive_timeout=75,
+            limit=64,
+            limit_per_host=16,
+            ssl=self.ssl_context,
+            # newer aiohttp warns when the flag is set on fixed Python versions
+            enable_cleanup_closed=getattr(
+                aiohttp.connector, "NEEDS_CLEANUP_CLOSED", True
+            ),
+        )
 
         self.api_trace_log = api_trace_log
 
@@ -44,36 +80,27 @@ class BitvavoClient:
     def _sign_payload(
         self,
         rest_call_type: RestCallType,
-        resource: str,
-        data: dict = None,
-        params: dict = None,
+        url: yarl.URL,
+        request_body: bytes = None,
         headers: dict = None,
     ) -> None:
         """Create signature payload."""
         timestamp = self._get_current_timestamp_ms()
 
-        resource_string = resource
-
-        if params is not None and len(params) > 0:
-            params_string = "&".join([f"{key}={val}" for key, val in params.items()])
-            if "?" in resource:
-                resource_string += "&"
-            else:
-                resource_string += "?"
-            resource_string += params_string
-
-        signature_string = (
-            str(timestamp) + rest_call_type.value + "/v2/" + resource_string
-        )
-        if data is not None:
-            signature_string += json.dumps(data, separators=(",", ":"))
-
-        LOG.debug(f"Signature input string: {signature_string}")
-        signature = hmac.new(
-            self.sec_key.encode("utf-8"),
-            signature_string.encode("utf-8"),
-            hashlib.sha256,
-        ).hexdigest()
+        # sign the path and query exactly as they are sent on the wire
+        signature_parts = [
+            str(timestamp).encode("utf-8"),
+            _REST_CALL_TYPE_BYTES[rest_call_type],
+            url.raw_path_qs.encode("utf-8"),
+        ]
+        # the api only accepts json bodies and signs them verbatim
+        if request_body is not None:
+            signature_parts.append(request_body)
+        signature_bytes = b"".join(signature_parts)
+
+        if LOG.isEnabledFor(logging.DEBUG):
+            LOG.debug(f"Signature input string: {signature_bytes.decode('utf-8')}")
+        signature = hmac.digest(self._sec_key_bytes, signature_bytes, "sha256").hex()
 
         headers["Bitvavo-Access-Key"] = self.api_key
         headers["Bitvavo-Access-Signature"] = signature
@@ -83,7 +110,7 @@ class BitvavoClient:
     @staticmethod
     def _preprocess_rest_response(status_code: int, body: Optional[dict]) -> None:
         """Trigger exception if needed."""
-        if str(status_code)[0] != "2":
+        if not 200 <= status_code < 300:
             raise BitvavoException(status_code, body)
 
     async def _create_get(
@@ -146,70 +173,60 @@ class BitvavoClient:
         api_variable_path: str = None,
     ) -> dict:
         """Create rest call."""
-        with Timer("RestCall"):
+        timer = Timer("RestCall") if self.api_trace_log else _NULL_CTX
+        with timer:
             # ensure headers is always a valid object
             if headers is None:
                 headers = {}
 
-            # add signature into the parameters
-            if signed:
-                self._sign_payload(rest_call_type, resource, data, params, headers)
-
             resource_uri = self._get_rest_api_uri()
             if api_variable_path is not None:
                 resource_uri += api_variable_path
             resource_uri += resource
 
-            if rest_call_type == RestCallType.GET:
-                rest_call = self._get_rest_session().get(
-                    resource_uri,
-                    json=data,
-                    params=params,
-                    headers=headers,
-                    ssl=self.ssl_context,
-                )
-            elif rest_call_type == RestCallType.POST:
-                rest_call = self._get_rest_session().post(
-                    resource_uri,
-                    json=data,
-                    params=params,
-                    headers=headers,
-                    ssl=self.ssl_context,
-                )
-            elif rest_call_type == RestCallType.DELETE:
-                rest_call = self._get_rest_session().delete(
-                    resource_uri,
-                    json=data,
-                    params=params,
-                    headers=headers,
-                    ssl=self.ssl_context,
-                )
-            elif rest_call_type == RestCallType.PUT:
-                rest_call = self._get_rest_session().put(
-                    resource_uri,
-                    json=data,
-                    params=params,
-                    headers=headers,
-                    ssl=self.ssl_context,
-                )
-            else:
-                raise Exception(f"Unsupported REST call type {rest_call_type}.")
+            url = yarl.URL(resource_uri)
+            if params:
+                url = url.with_query(params)
+
+            # serialize once, so the signed body is the body that is sent
+            request_body = None
+            if data is not None:
+                request_body = _dumps(data)
+                headers["Content-Type"] = "application/json"
+
+            # add signature into the parameters
+            if signed:
+                self._sign_payload(rest_call_type, url, request_body, headers)
 
-            LOG.debug(
-                f"> rest type [{rest_call_type.name}], "
-                "resource [{resource}], params [{params}], headers [{headers}], data [{data}]"
+            rest_call = self._get_rest_session().request(
+                rest_call_type,
+                url,
+                data=request_body,
+                headers=headers,
             )
+
+            if LOG.isEnabledFor(logging.DEBUG):
+                LOG.debug(
+                    f"> rest type [{rest_call_type.name}], resource [{resource}], "
+                    f"params [{params}], headers [{headers}], data [{data}]"
+                )
             async with rest_call as response:
                 status_code = response.status
-                body = await response.text()
+                body = await response.read()
 
-                LOG.debug(f"<: status [{status_code}], response [{body}]")
+                if LOG.isEnabledFor(logging.DEBUG):
+                    LOG.debug(
+                        f"<: status [{status_code}], "
+                        f"response [{body.decode('utf-8', errors='replace')}]"
+                    )
 
-                if len(body) > 0:
+                if body:
                     try:
-                        body = json.loads(body)
+                        body = _loads(body)
                     except json.JSONDecodeError:
-                        body = {"raw": body}
+                        body = {"raw": body.decode("utf-8", errors="replace")}
+                else:
+                    body = ""
 
                 self._preprocess_rest_response(status_code, body)
 
@@ -228,59 +245,38 @@ class BitvavoClient:
         else:
             trace_configs = None
 
-        self.rest_session = aiohttp.ClientSession(trace_configs=trace_configs)
+        self.rest_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(**self._connector_kwargs),
+            trace_configs=trace_configs,
+        )
 
         return self.rest_session
 
     @staticmethod
     def _clean_request_params(params: dict) -> dict:
         """Create clean parameters."""
-        clean_params = {}
-        for key, value in params.items():
-            if value is not None:
-                clean_params[key] = str(value)
-
-        return clean_params
+        return {
+            key: value if type(value) is str else str(value)
+            for key, value in params.items()
+            if value is not None
+        }
 
     async def _on_request_start(self, trace_config_ctx, params) -> None:
         """Log request start."""
-        LOG.debug(f"> Context: {trace_config_ctx}")
-        LOG.debug(f"> Params: {params}")
+        if LOG.isEnabledFor(logging.DEBUG):
+            LOG.debug(f"> Context: {trace_config_ctx}")
+            LOG.debug(f"> Params: {params}")
 
     async def _on_request_end(self, trace_config_ctx, params) -> None:
         """Log request end."""
-        LOG.debug(f"< Context: {trace_config_ctx}")
-        LOG.debug(f"< Params: {params}")
+        if LOG.isEnabledFor(logging.DEBUG):
+            LOG.debug(f"< Context: {trace_config_ctx}")
+            LOG.debug(f"< Params: {params}")
 
     @staticmethod
     def _get_current_timestamp_ms() -> int:
         """Return timestamp."""
-        return int(datetime.datetime.now(tz=datetime.timezone.utc).timestamp() * 1000)
-
-    def _get_signature(self, params: dict, data: dict) -> str:
-        """Return signature."""
-        params_string = ""
-        data_string = ""
-
-        if params is not None:
-            params_string = "&".join([f"{key}={val}" for key, val in params.items()])
-
-        if data is not None:
-            data_string = "&".join(
-                ["{}={}".format(param[0], param[1]) for param in data]
-            )
-
-        hmacstr = hmac.new(
-            self.sec_key.encode("utf-8"),
-            (params_string + data_string).encode("utf-8"),
-            hashlib.sha256,
-        )
-        return hmacstr.hexdigest()
-
-    @staticmethod
-    def _map_pair(pair: Pair) -> str:
-        """Return pair string."""
-        return f"{pair.base}-{pair.quote}"
+        return time.time_ns() // 1_000_000
 
     async def close(self) -> None:
         """Close session."""
@@ -297,7 +293,7 @@ class BitvavoClient:
         params = self._clean_request_params({})
 
         if pair:
-            params["market"] = self._map_pair(pair)
+            params["market"] = pair.market
 
         return await self._create_get("markets", params=params)
 
@@ -314,7 +310,7 @@ class BitvavoClient:
         if limit:
             params["depth"] = limit
 
-        return await self._create_get(f"{self._map_pair(pair)}/book", params=params)
+        return await self._create_get(_BOOK(pair.market), params=params)
 
     async def get_trades(self, pair: Pair, limit: int = None) -> dict:
         """Get trades API call."""
@@ -323,14 +319,14 @@ class BitvavoClient:
         if limit:
             params["limit"] = limit
 
-        return await self._create_get(f"{self._map_pair(pair)}/trades", params=params)
+        return await self._create_get(_TRADES(pair.market), params=params)
 
     async def get_price_ticker(self, pair: Optional[Pair] = None) -> dict:
         """Get price ticker API call."""
         params = self._clean_request_params({})
 
         if pair:
-            params["market"] = self._map_pair(pair)
+            params["market"] = pair.market
 
         return await self._create_get("ticker/price", params=params)
 
@@ -339,7 +335,7 @@ class BitvavoClient:
         params = self._clean_request_params({})
 
         if pair:
-            params["market"] = self._map_pair(pair)
+            params["market"] = pair.market
 
         return await self._create_get("ticker/book", params=params)
 
@@ -348,7 +344,7 @@ class BitvavoClient:
         params = self._clean_request_params({})
 
         if pair:
-            params["market"] = self._map_pair(pair)
+            params["market"] = pair.market
 
         return await self._create_get("ticker/24h", params=params)
 
@@ -357,19 +353,19 @@ class BitvavoClient:
         params = self._clean_request_params({})
 
         if pair:
-            params["market"] = self._map_pair(pair)
+            params["market"] = pair.market
 
         return await self._create_get("ordersOpen", params=params, signed=True)
 
     async def get_orders(self, pair: Pair = None) -> dict:
         """Get orders API call."""
-        params = self._clean_request_params({"market": self._map_pair(pair)})
+        params = self._clean_request_params({"market": pair.market})
 
         return await self._create_get("orders", params=params, signed=True)
 
     async def get_historical_trades(self, pair: Pair = None, limit: int = None) -> dict:
         """Get trades history API call."""
-        params = self._clean_request_params({"market": self._map_pair(pair)})
+        params = self._clean_request_params({"market": pair.market})
 
         if limit:
             params["limit"] = limit
@@ -429,9 +425,9 @@ class BitvavoClient:
         """Get create order API call."""
         data = self._clean_request_params(
             {
-                "market": self._map_pair(pair),
-                "side": side.value,
-                "orderType": type.value,
+                "market": pair.market,
+                "side": side,
+                "orderType": type,
                 "amount": amount,
                 "price": price,
                 "amountQuote": amount_quote,
@@ -442,31 +438,31 @@ class BitvavoClient:
         )
 
         if time_in_force is not None:
-            data["timeInForce"] = time_in_force.value
+            data["timeInForce"] = time_in_force
 
-        if time_in_force is not None:
-            data["selfTradePrevention"] = self_trade_prevention.value
+        if self_trade_prevention is not None:
+            data["selfTradePrevention"] = self_trade_prevention
 
         return await self._create_post("order", data=data, signed=True)
 
     async def cancel_order(self, pair: Pair, order_id: str) -> dict:
         """Get cancel order API call."""
         params = self._clean_request_params(
-            {"market": self._map_pair(pair), "orderId": order_id}
+            {"market": pair.market, "orderId": order_id}
         )
 
         return await self._create_delete("order", params=params, signed=True)
 
     async def cancel_orders(self, pair: Pair) -> dict:
         """Get cancel orders API call."""
-        params = self._clean_request_params({"market": self._map_pair(pair)})
+        params = self._clean_request_params({"market": pair.market})
 
         return await self._create_delete("orders", params=params, signed=True)
 
     async def get_order(self, pair: Pair, order_id: str) -> dict:
         """Get get order API call."""
         params = self._clean_request_params(
-            {"market": self._map_pair(pair), "orderId": order_id}
+            {"market": pair.market, "orderId": order_id}
         )
 
         return await self._create_get("order", params=params, signed=True)
@@ -480,4 +476,4 @@ class BitvavoClient:
         if limit:
             params["limit"] = limit
 
-        return await self._create_get(f"{self._map_pair(pair)}/candles", params=params)
+        return await self._create_get(_CANDLES(pair.market), params=params)
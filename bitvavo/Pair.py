@@ -1,15 +1,30 @@
 """Pair related code."""
 
+from functools import cached_property
+
 
 class Pair:
     """Pair object."""
 
+    # cached_property stores its value in the instance __dict__
+    __slots__ = ("base", "quote", "__dict__")
+
     def __init__(self, base: str, quote: str):
         self.base = base
         self.quote = quote
 
-    def __str__(self):
-        return self.base + self.quote
+    @cached_property
+    def market(self) -> str:
+        """Return market string."""
+        return f"{self.base}-{self.quote}"
+
+    def __eq__(self, other):
+        if not isinstance(other, Pair):
+            return NotImplemented
+        return (self.base, self.quote) == (other.base, other.quote)
+
+    def __hash__(self):
+        return hash((self.base, self.quote))
 
     def __repr__(self):
-        return self.__str__()
+        return self.market
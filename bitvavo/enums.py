@@ -3,7 +3,14 @@
 import enum
 
 
-class RestCallType(enum.Enum):
+class _StrEnum(str, enum.Enum):
+    """String valued enumeration."""
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class RestCallType(_StrEnum):
     """REST CallTypes."""
 
     GET = "GET"
@@ -12,14 +19,14 @@ class RestCallType(enum.Enum):
     PUT = "PUT"
 
 
-class OrderSide(enum.Enum):
+class OrderSide(_StrEnum):
     """Order Side."""
 
     BUY = "BUY"
     SELL = "SELL"
 
 
-class OrderType(enum.Enum):
+class OrderType(_StrEnum):
     """Order Types."""
 
     LIMIT = "LIMIT"
@@ -31,7 +38,7 @@ class OrderType(enum.Enum):
     LIMIT_MAKER = "LIMIT_MAKER"
 
 
-class CandelstickInterval(enum.Enum):
+class CandelstickInterval(_StrEnum):
     """CandelStick Intervals."""
 
     I_1MIN = "1m"
@@ -51,7 +58,7 @@ class CandelstickInterval(enum.Enum):
     I_1MONTH = "1M"
 
 
-class OrderResponseType(enum.Enum):
+class OrderResponseType(_StrEnum):
     """Order Response Type."""
 
     ACT = "ACK"
@@ -59,7 +66,7 @@ class OrderResponseType(enum.Enum):
     FULL = "FULL"
 
 
-class TimeInForce(enum.Enum):
+class TimeInForce(_StrEnum):
     """Time Settings."""
 
     GOOD_TILL_CANCELLED = "GTC"
@@ -67,7 +74,7 @@ class TimeInForce(enum.Enum):
     FILL_OR_KILL = "FOK"
 
 
-class SelfTradePrevention(enum.Enum):
+class SelfTradePrevention(_StrEnum):
     """Trade Preventions."""
 
     DECREMENT_AND_CANCEL = "decrementAndCancel"
@@ -19,8 +19,7 @@ setuptools.setup(
 		"Framework :: AsyncIO",
 		"Intended Audience :: Developers",
 		"Programming Language :: Python :: 3",
-		"Programming Language :: Python :: 3.6",
-		"Programming Language :: Python :: 3.7",
+		"Programming Language :: Python :: 3.8",
 		"License :: OSI Approved :: MIT License",
 		"Operating System :: OS Independent",
 		"Topic :: Software Development :: Libraries",
@@ -29,6 +28,10 @@ setuptools.setup(
 	],
 	install_requires=[
 		'aiohttp>=3.7.4,<4',
+		'yarl',
 	],
-	python_requires='>=3.6',
+	extras_require={
+		'speedups': ['orjson'],
+	},
+	python_requires='>=3.8',
 )